@@ -0,0 +1,14 @@
+"""
+Shared path setup for the scripts in setup/.
+
+Importing this module puts the repo's src/ directory on sys.path so the
+scripts can import `piper` without an install. It only inserts the path
+once, so importing it from several scripts in one process is harmless.
+"""
+import sys
+from pathlib import Path
+
+SRC_DIR = str(Path(__file__).resolve().parent.parent / "src")
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -7,9 +7,7 @@ Tests adapter detection and basic arm functionality.
 import sys
 import argparse
 
-# Add src to path for imports
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+import _bootstrap  # noqa: F401 - puts src/ on sys.path
 
 from piper import PiperArm, detect_adapter
 from piper.adapters.standard import find_socketcan_port
@@ -48,52 +46,62 @@ def test_detection():
     return True
 
 
-def test_connection(adapter: str = "auto"):
-    """Test arm connection and state reading."""
-    print(f"=== Connection Test (adapter={adapter}) ===")
-    print()
-
+def run_arm_tests(adapter, tests):
+    """Connect once and run each arm test against the same connection."""
     try:
         with PiperArm(adapter=adapter) as arm:
-            print("[OK] Connected successfully")
-            print()
-            arm.print_state()
-            return True
+            success = True
+            for test in tests:
+                if not test(arm):
+                    success = False
+                print()
+            return success
     except Exception as e:
         print(f"[!!] Connection failed: {e}")
+        print()
         return False
 
 
-def test_movement(adapter: str = "auto"):
+def test_connection(arm):
+    """Test arm connection and state reading."""
+    print(f"=== Connection Test ({type(arm).__name__}) ===")
+    print()
+
+    print("[OK] Connected successfully")
+    print()
+    arm.print_state()
+    return True
+
+
+def test_movement(arm):
     """Test arm movement (small movements only)."""
-    print(f"=== Movement Test (adapter={adapter}) ===")
+    print(f"=== Movement Test ({type(arm).__name__}) ===")
     print()
     print("WARNING: Arm will make small movements!")
     print()
 
     try:
-        with PiperArm(adapter=adapter) as arm:
-            print("Initial state:")
-            arm.print_state()
-            print()
-
-            print("Moving Joint 2 by +5°...")
-            arm.move_joint_by(1, 5, wait=1.5)
-            arm.print_state()
-            print()
-
-            print("Moving Joint 2 by -5°...")
-            arm.move_joint_by(1, -5, wait=1.5)
-            arm.print_state()
-            print()
-
-            print("Testing gripper...")
-            arm.close_gripper(wait=0.5)
-            arm.open_gripper(wait=0.5)
-            print()
-
-            print("[OK] Movement test complete")
-            return True
+        print("Initial state:")
+        arm.print_state()
+        print()
+
+        print("Moving Joint 2 by +5°...")
+        arm.move_joint_by(1, 5, wait=1.5)
+        arm.print_state()
+        print()
+
+        print("Moving Joint 2 by -5°...")
+        arm.move_joint_by(1, -5, wait=1.5)
+        arm.print_state()
+        print()
+
+        print("Testing gripper...")
+        arm.close_gripper(wait=0.5)
+        arm.open_gripper(wait=0.5)
+        print()
+
+        print("[OK] Movement test complete")
+        return True
     except Exception as e:
         print(f"[!!] Movement test failed: {e}")
         return False
@@ -127,15 +135,15 @@ def main():
             success = False
         print()
 
+    # Arm tests share one connection so "all" only enables the arm once
+    arm_tests = []
     if args.test in ["connect", "all"]:
-        if not test_connection(args.adapter):
-            success = False
-        print()
-
+        arm_tests.append(test_connection)
     if args.test in ["move", "all"]:
-        if not test_movement(args.adapter):
-            success = False
-        print()
+        arm_tests.append(test_movement)
+
+    if arm_tests and not run_arm_tests(args.adapter, arm_tests):
+        success = False
 
     print("=" * 40)
     if success:
@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 """Test the WavesharePiperArm adapter with a small movement."""
-import sys
 import math
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+import _bootstrap  # noqa: F401 - puts src/ on sys.path
 
 from piper.adapters.waveshare import WavesharePiperArm
 
+def snapshot(arm):
+    """Read joint state once; return (radians, degrees) from the same sample."""
+    joints = list(arm.state.joints)
+    return joints, list(map(math.degrees, joints))
+
+def print_joints(joints_deg):
+    """Print all joints with a single write."""
+    print("\n".join(f"  J{i+1}: {j:.2f}°" for i, j in enumerate(joints_deg)))
+
 def main():
     print("=== Testing WavesharePiperArm Adapter ===\n")
 
@@ -16,10 +23,8 @@ def main():
     arm.connect()
 
     print("\n--- Initial Position ---")
-    joints = arm.state.joints
-    joints_deg = [math.degrees(j) for j in joints]
-    for i, j in enumerate(joints_deg):
-        print(f"  J{i+1}: {j:.2f}°")
+    joints, joints_deg = snapshot(arm)
+    print_joints(joints_deg)
 
     # Move J6 by +5 degrees
     target = list(joints)
@@ -29,10 +34,8 @@ def main():
     arm.move_joints(target, wait=0)  # Don't add extra wait, _send_joint_command already waits
 
     print("\n--- Position After Move ---")
-    new_joints = arm.state.joints
-    new_joints_deg = [math.degrees(j) for j in new_joints]
-    for i, j in enumerate(new_joints_deg):
-        print(f"  J{i+1}: {j:.2f}°")
+    _, new_joints_deg = snapshot(arm)
+    print_joints(new_joints_deg)
 
     delta = new_joints_deg[5] - joints_deg[5]
     print(f"\nJ6 movement: {delta:.2f}° (expected: ~5°)")
@@ -42,10 +45,8 @@ def main():
     arm.move_joints(joints, wait=0)
 
     print("\n--- Final Position ---")
-    final_joints = arm.state.joints
-    final_joints_deg = [math.degrees(j) for j in final_joints]
-    for i, j in enumerate(final_joints_deg):
-        print(f"  J{i+1}: {j:.2f}°")
+    _, final_joints_deg = snapshot(arm)
+    print_joints(final_joints_deg)
 
     delta2 = final_joints_deg[5] - joints_deg[5]
     print(f"\nJ6 difference from initial: {delta2:.2f}° (should be ~0°)")
@@ -6,14 +6,21 @@ Tests both arms can connect, read state, and make small movements.
 """
 import sys
 import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+import _bootstrap  # noqa: F401 - puts src/ on sys.path
 
 from piper import create_arm
 from piper.can import find_all_waveshare_ports
 
 
+def run_both(pool, he_fn, she_fn, *args):
+    """Run the same call on both arms concurrently (each has its own adapter)."""
+    futures = [pool.submit(he_fn, *args), pool.submit(she_fn, *args)]
+    for future in futures:
+        future.result()
+
+
 def test_dual_waveshare():
     """Test both Waveshare adapters."""
     print("=" * 50)
@@ -36,23 +43,28 @@ def test_dual_waveshare():
     print(f"      she: {she_port}")
     print()
 
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        return check_arms(pool, he_port, she_port)
+
+
+def check_arms(pool, he_port, she_port):
+    """Connect, read and move both arms, driving them concurrently."""
     # Connect both arms
     print("[2/4] Connecting to both arms...")
-    try:
-        he_arm = create_arm(adapter="waveshare", can_port=he_port)
-        he_arm.connect()
-        print(f"      [OK] he arm connected")
-    except Exception as e:
-        print(f"      [FAIL] he arm: {e}")
-        return False
-
-    try:
-        she_arm = create_arm(adapter="waveshare", can_port=she_port)
-        she_arm.connect()
-        print(f"      [OK] she arm connected")
-    except Exception as e:
-        print(f"      [FAIL] she arm: {e}")
+    he_arm = create_arm(adapter="waveshare", can_port=he_port)
+    she_arm = create_arm(adapter="waveshare", can_port=she_port)
+    futures = {"he": pool.submit(he_arm.connect), "she": pool.submit(she_arm.connect)}
+    connect_failed = False
+    for label, future in futures.items():
+        try:
+            future.result()
+            print(f"      [OK] {label} arm connected")
+        except Exception as e:
+            print(f"      [FAIL] {label} arm: {e}")
+            connect_failed = True
+    if connect_failed:
         he_arm.disconnect()
+        she_arm.disconnect()
         return False
     print()
 
@@ -78,8 +90,7 @@ def test_dual_waveshare():
 
     try:
         print("      Moving both arms J2 +5°...")
-        he_arm.move_joint_by(1, 5)
-        she_arm.move_joint_by(1, 5)
+        run_both(pool, he_arm.move_joint_by, she_arm.move_joint_by, 1, 5)
         time.sleep(1.5)
 
         print("      Reading positions...")
@@ -87,8 +98,7 @@ def test_dual_waveshare():
         she_arm.print_state()
 
         print("      Moving both arms J2 -5°...")
-        he_arm.move_joint_by(1, -5)
-        she_arm.move_joint_by(1, -5)
+        run_both(pool, he_arm.move_joint_by, she_arm.move_joint_by, 1, -5)
         time.sleep(1.5)
 
         print("      Final positions:")
@@ -103,8 +113,7 @@ def test_dual_waveshare():
         return False
 
     # Cleanup
-    he_arm.disconnect()
-    she_arm.disconnect()
+    run_both(pool, he_arm.disconnect, she_arm.disconnect)
 
     print()
     print("=" * 50)
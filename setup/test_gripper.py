@@ -12,94 +12,195 @@ SDK gripper demo pattern:
 3. GripperCtrl(0, 1000, 0x01, 0) - enable with mode 0x01
 4. Loop: GripperCtrl(position, 1000, 0x01, 0)
 """
-import sys
+import argparse
+import os
+import struct
+import threading
 import time
 import can
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+import _bootstrap  # noqa: F401 - puts src/ on sys.path
 
 from piper.adapters.waveshare import WavesharePiperArm
 
-def send_motor_enable(bus, motor_num=0xFF, enable=True):
-    """Send motor enable command. motor_num: 1-6=joints, 7=gripper, 0xFF=all"""
+# Gripper ctrl payload: position (int32), effort (uint16, UNSIGNED), mode, set_zero - big-endian
+GRIPPER_CTRL = struct.Struct(">iHBB")
+
+def pace(period, duration):
+    """Yield ticks every `period` seconds for `duration` on a monotonic deadline schedule.
+
+    Deadlines are absolute (start + i*period), so sleep overshoot on one tick
+    is absorbed by the next instead of accumulating as drift.
+    """
+    start = time.monotonic()
+    for i in range(max(1, int(round(duration / period)))):
+        slack = start + i * period - time.monotonic()
+        if slack > 0:
+            time.sleep(slack)
+        yield i
+
+def promote_realtime(cpu=2, priority=20):
+    """Pin the process to one CPU and switch it to SCHED_FIFO.
+
+    Call before starting the sender thread, which inherits both settings, so
+    the 200Hz loop is not preempted by ordinary tasks. Keeping other work off
+    that CPU (isolcpus=<cpu> on the kernel command line) helps further.
+    Needs root or CAP_SYS_NICE; without it this warns and carries on.
+    """
+    if not hasattr(os, "sched_setscheduler"):
+        print("Realtime scheduling not supported on this platform")
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu})
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+    except PermissionError:
+        print("Realtime scheduling needs root or CAP_SYS_NICE, continuing without it")
+        return False
+    except OSError as e:
+        print(f"Realtime scheduling failed ({e}), continuing without it")
+        return False
+    print(f"Realtime: SCHED_FIFO priority {priority} on CPU {cpu}")
+    return True
+
+class PeriodicSender:
+    """Background thread that re-sends the current frame set every `period` seconds.
+
+    Keepalive frames (motor enable, motion ctrl) only need ~10Hz, so they go
+    out every `keepalive_every` ticks while the command frames run at full rate.
+    set() encodes both variants up front, so each tick is one write of
+    prebuilt bytes. The swap is a single reference assignment (no lock), and
+    the main thread stays free to read feedback while the arm is driven.
+    """
+
+    def __init__(self, bus, period, keepalive_every=20):
+        self._bus = bus
+        self._period = period
+        self._keepalive_every = keepalive_every
+        self._payloads = (b"", b"")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def set(self, msgs, keepalive=()):
+        encode = self._bus.encode_batch
+        # (every tick, keepalive tick)
+        self._payloads = (encode(msgs), encode(list(keepalive) + list(msgs)))
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+    def _run(self):
+        next_t = time.monotonic()
+        tick = 0
+        while not self._stop.is_set():
+            payload, keepalive_payload = self._payloads
+            if tick % self._keepalive_every == 0:
+                payload = keepalive_payload
+            self._bus.send_encoded(payload)
+            tick += 1
+            next_t += self._period
+            slack = next_t - time.monotonic()
+            if slack > 0:
+                self._stop.wait(slack)
+            elif slack < -self._period:
+                next_t = time.monotonic()  # Fell behind: resync instead of bursting
+
+def hold(arm, sender, msgs, duration, keepalive=()):
+    """Drive `msgs` for `duration` seconds, printing gripper feedback once per second."""
+    sender.set(msgs, keepalive)
+    start = time.monotonic()
+    end = start + duration
+    while True:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(1.0, remaining))
+        print(f"    t={time.monotonic() - start:.1f}s gripper={arm.state.gripper:.3f}")
+    sender.set(())
+
+def motor_enable_msg(motor_num=0xFF, enable=True):
+    """Build motor enable command. motor_num: 1-6=joints, 7=gripper, 0xFF=all"""
     enable_flag = 0x02 if enable else 0x01
-    bus.send(can.Message(
+    return can.Message(
         arbitration_id=0x471,
         data=bytes([motor_num, enable_flag, 0, 0, 0, 0, 0, 0]),
         is_extended_id=False,
-    ))
+    )
 
-def send_gripper_ctrl(bus, position_um, effort=1000, mode=0x01, set_zero=0x00):
-    """Send gripper control. position_um in 0.001mm, effort in 0.001N·m (0-5000)"""
-    pos_bytes = position_um.to_bytes(4, 'big', signed=True)
-    effort_bytes = effort.to_bytes(2, 'big', signed=False)  # UNSIGNED
-    bus.send(can.Message(
+def gripper_ctrl_msg(position_um, effort=1000, mode=0x01, set_zero=0x00):
+    """Build gripper control. position_um in 0.001mm, effort in 0.001N·m (0-5000)"""
+    return can.Message(
         arbitration_id=0x159,
-        data=pos_bytes + effort_bytes + bytes([mode, set_zero]),
+        data=GRIPPER_CTRL.pack(position_um, effort, mode, set_zero),
         is_extended_id=False,
-    ))
+    )
 
-def send_motion_ctrl(bus, ctrl_mode=0x01, move_mode=0x01, speed=50):
-    """Send motion control command."""
-    bus.send(can.Message(
+def motion_ctrl_msg(ctrl_mode=0x01, move_mode=0x01, speed=50):
+    """Build motion control command."""
+    return can.Message(
         arbitration_id=0x151,
         data=bytes([ctrl_mode, move_mode, speed, 0, 0, 0, 0, 0]),
         is_extended_id=False,
-    ))
+    )
 
 def main():
+    parser = argparse.ArgumentParser(description="Gripper open/close test")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Run with SCHED_FIFO pinned to one CPU (needs root or CAP_SYS_NICE)")
+    parser.add_argument("--cpu", type=int, default=2, help="CPU to pin to with --realtime (default: 2)")
+    args = parser.parse_args()
+
+    if args.realtime:
+        promote_realtime(args.cpu)
+
     arm = WavesharePiperArm(port="auto", verbose=True)
     arm.connect()
+    bus = arm._bus
+
+    # Payloads never change inside a loop: build each frame once, then just send
+    enable_all = motor_enable_msg(0xFF, True)
+    motion = motion_ctrl_msg()
+    gripper_init = gripper_ctrl_msg(0, 1000, mode=0x02)
+    gripper_close = gripper_ctrl_msg(0, 1000, mode=0x01)      # pos=0 (closed)
+    gripper_open = gripper_ctrl_msg(50000, 1000, mode=0x01)   # pos=50mm
 
     print(f"Initial gripper: {arm.state.gripper:.3f}")
 
     # Step 1: Enable all motors (like SDK EnablePiper)
     print("\n1. Enabling all motors...")
-    for _ in range(50):
-        send_motor_enable(arm._bus, 0xFF, True)  # Enable all
-        send_motion_ctrl(arm._bus)
-        time.sleep(0.01)
+    for _ in pace(0.01, 0.5):
+        bus.send_batch((enable_all, motion))
 
     # Step 2: Initialize gripper with mode 0x02 (like SDK GripperCtrl(0, 1000, 0x02, 0))
     print("2. Initializing gripper (mode 0x02 = disable + clear error)...")
-    for _ in range(50):
-        send_motor_enable(arm._bus, 0xFF, True)
-        send_motion_ctrl(arm._bus)
-        send_gripper_ctrl(arm._bus, 0, 1000, mode=0x02)
-        time.sleep(0.01)
+    for _ in pace(0.01, 0.5):
+        bus.send_batch((enable_all, motion, gripper_init))
 
     # Step 3: Enable gripper with mode 0x01 (like SDK GripperCtrl(0, 1000, 0x01, 0))
     print("3. Enabling gripper (mode 0x01 = enable)...")
-    for _ in range(50):
-        send_motor_enable(arm._bus, 0xFF, True)
-        send_motion_ctrl(arm._bus)
-        send_gripper_ctrl(arm._bus, 0, 1000, mode=0x01)
-        time.sleep(0.01)
+    for _ in pace(0.01, 0.5):
+        bus.send_batch((enable_all, motion, gripper_close))
 
     print(f"After init: gripper={arm.state.gripper:.3f}")
 
+    sender = PeriodicSender(bus, 0.005).start()
+
     # Step 4: Close gripper (position=0)
     print("\n>>> CLOSING GRIPPER (5 seconds)...")
-    start = time.time()
-    while time.time() - start < 5.0:
-        send_motor_enable(arm._bus, 0xFF, True)
-        send_motion_ctrl(arm._bus)
-        send_gripper_ctrl(arm._bus, 0, 1000, mode=0x01)  # pos=0 (closed)
-        time.sleep(0.005)
+    hold(arm, sender, [gripper_close], 5.0, keepalive=[enable_all, motion])
 
     print(f"After close: gripper={arm.state.gripper:.3f}")
 
     # Step 5: Open gripper (position=50000 = 50mm, like SDK demo)
     print("\n>>> OPENING GRIPPER (5 seconds)...")
-    start = time.time()
-    while time.time() - start < 5.0:
-        send_motor_enable(arm._bus, 0xFF, True)
-        send_motion_ctrl(arm._bus)
-        send_gripper_ctrl(arm._bus, 50000, 1000, mode=0x01)  # pos=50mm
-        time.sleep(0.005)
+    hold(arm, sender, [gripper_open], 5.0, keepalive=[enable_all, motion])
 
     print(f"After open: gripper={arm.state.gripper:.3f}")
 
+    sender.stop()
     arm.disconnect()
     print("\nDone - did the gripper open and close?")
 
@@ -3,12 +3,14 @@
 import sys
 import math
 import json
+from operator import itemgetter
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+import _bootstrap  # noqa: F401 - puts src/ on sys.path
 
 from piper import create_arm
 
 POSES_FILE = str(Path(__file__).resolve().parent.parent / "scripts" / "poses.json")
+JOINT_VALUES = itemgetter("J1", "J2", "J3", "J4", "J5", "J6")
 
 def load_poses():
     with open(POSES_FILE) as f:
@@ -16,10 +18,13 @@ def load_poses():
     poses = {}
     for scene in data.get("scenes", []):
         name = scene["name"]
-        joints = scene["joint_positions"]
-        joints_deg = [float(joints[j]) for j in ["J1", "J2", "J3", "J4", "J5", "J6"]]
+        joints_deg = list(map(float, JOINT_VALUES(scene["joint_positions"])))
         intended = scene.get("intended_look", "")
-        poses[name] = {"joints_deg": joints_deg, "intended": intended}
+        poses[name] = {
+            "joints_deg": joints_deg,
+            "joints_rad": list(map(math.radians, joints_deg)),
+            "intended": intended,
+        }
     return poses
 
 def main():
@@ -46,9 +51,8 @@ def main():
             print(f"Joints: J1={joints_deg[0]:.0f} J2={joints_deg[1]:.0f} J3={joints_deg[2]:.0f} J4={joints_deg[3]:.0f} J5={joints_deg[4]:.0f} J6={joints_deg[5]:.0f}")
             print("-" * 60)
 
-            # Move to pose
-            joints_rad = [math.radians(d) for d in joints_deg]
-            arm.move_joints(joints_rad, wait=0)
+            # Move to pose (radians converted at load time)
+            arm.move_joints(pose["joints_rad"], wait=0)
 
             # Signal ready
             print(f"\n>>> NOW SHOWING: {name}")
@@ -1,15 +1,14 @@
 #!/usr/bin/env python3
 """Visual test - moves each joint and gripper one by one."""
-import sys
 import math
 import time
-from pathlib import Path
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+import _bootstrap  # noqa: F401 - puts src/ on sys.path
 
 from piper.adapters.waveshare import WavesharePiperArm
 
 # Movement amount in degrees (10% of typical ~100° range)
 MOVE_DEG = 10.0
+MOVE_RAD = math.radians(MOVE_DEG)
 HOLD_TIME = 1.0  # seconds to hold at moved position
 
 def main():
@@ -21,27 +20,29 @@ def main():
     with WavesharePiperArm(port="auto", verbose=False) as arm:
         print("[Connected]\n")
 
-        # Get initial position
-        initial = list(arm.state.joints)
-        initial_gripper = arm.state.gripper
+        # Get initial position (one state read covers joints and gripper)
+        state = arm.state
+        initial = list(state.joints)
+        initial_deg = list(map(math.degrees, initial))
+        initial_gripper = state.gripper
 
         print("Initial position:")
-        for i, j in enumerate(initial):
-            print(f"  J{i+1}: {math.degrees(j):+.1f}°")
+        for i, d in enumerate(initial_deg):
+            print(f"  J{i+1}: {d:+.1f}°")
         print(f"  Gripper: {initial_gripper:.2f}")
         print()
 
         # Test each joint
         for joint_idx in range(6):
             joint_name = f"J{joint_idx + 1}"
-            current_deg = math.degrees(initial[joint_idx])
+            current_deg = initial_deg[joint_idx]
             target_deg = current_deg + MOVE_DEG
 
             print(f"--- {joint_name}: {current_deg:+.1f}° → {target_deg:+.1f}° ---")
 
             # Move to target
             target = list(initial)
-            target[joint_idx] = math.radians(target_deg)
+            target[joint_idx] = initial[joint_idx] + MOVE_RAD
             arm.move_joints(target, wait=0)
 
             # Hold
@@ -76,10 +77,10 @@ def main():
 
         # Final position check
         print("Final position:")
-        final = arm.state.joints
-        for i, j in enumerate(final):
-            diff = math.degrees(j) - math.degrees(initial[i])
-            print(f"  J{i+1}: {math.degrees(j):+.1f}° (diff: {diff:+.2f}°)")
+        final_deg = list(map(math.degrees, arm.state.joints))
+        for i, d in enumerate(final_deg):
+            diff = d - initial_deg[i]
+            print(f"  J{i+1}: {d:+.1f}° (diff: {diff:+.2f}°)")
         print()
 
     print("=" * 50)
@@ -4,33 +4,49 @@ Standard Piper arm adapter using piper_sdk directly.
 Uses the low-level piper_sdk for fast initialization with explicit timeouts.
 Requires a socketcan interface (can0 or slcan0).
 """
-import math
+import operator
+import os
 import time
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import can
-from piper_sdk import C_PiperInterface_V2
+from ..base import GRIPPER_RANGE_UM, MDEG_TO_RAD, RAD_TO_MDEG, UM_TO_GRIPPER, PiperArmBase
 
-from ..base import PiperArmBase
+if TYPE_CHECKING:
+    from piper_sdk import C_PiperInterface_V2
 
 
 # Standard CAN ports to check
 CAN_PORTS = ["slcan0", "can0"]
+SYSFS_NET = "/sys/class/net"
+# slcan reports "unknown" rather than "up" once brought up
+USABLE_OPERSTATES = ("up", "unknown")
 
 # Timeouts
 ENABLE_TIMEOUT_S = 2.0
-ENABLE_RETRY_INTERVAL_S = 0.01
+# EnablePiper() returns True as soon as feedback shows all motors enabled;
+# polling finer than the arm's status rate gains nothing
+ENABLE_RETRY_INTERVAL_S = 0.002
+
+# Reads all six joint_state fields (millidegrees) in one call
+JOINT_FIELDS = operator.attrgetter(
+    "joint_1", "joint_2", "joint_3", "joint_4", "joint_5", "joint_6",
+)
 
 
 def find_socketcan_port() -> Optional[str]:
-    """Find an available socketcan port."""
+    """Find an available socketcan port.
+
+    Reads each candidate's operstate from sysfs instead of opening a CAN
+    socket; nothing is opened until the arm actually connects.
+    """
     for port in CAN_PORTS:
         try:
-            bus = can.interface.Bus(channel=port, interface="socketcan")
-            bus.shutdown()
-            return port
-        except Exception:
+            with open(os.path.join(SYSFS_NET, port, "operstate")) as f:
+                state = f.read().strip()
+        except OSError:
             continue
+        if state in USABLE_OPERSTATES:
+            return port
     return None
 
 
@@ -51,9 +67,13 @@ class StandardPiperArm(PiperArmBase):
         """
         super().__init__(verbose=verbose)
         self.can_port = can_port
-        self._piper: Optional[C_PiperInterface_V2] = None
+        self._piper: Optional["C_PiperInterface_V2"] = None
+        self._mdeg = [0] * 6  # Reused JointCtrl argument buffer (millidegrees)
 
     def _connect(self) -> None:
+        # Imported here so port detection doesn't pay for loading the SDK
+        from piper_sdk import C_PiperInterface_V2
+
         if self.can_port == "auto":
             port = find_socketcan_port()
             if not port:
@@ -66,10 +86,11 @@ class StandardPiperArm(PiperArmBase):
 
         # Enable arm with timeout
         self._log("Enabling arm...")
-        start = time.time()
+        start = time.monotonic()
+        deadline = start + ENABLE_TIMEOUT_S
         enabled = False
         attempts = 0
-        while time.time() - start < ENABLE_TIMEOUT_S:
+        while time.monotonic() < deadline:
             if self._piper.EnablePiper():
                 enabled = True
                 break
@@ -79,7 +100,7 @@ class StandardPiperArm(PiperArmBase):
         if not enabled:
             raise RuntimeError(f"Failed to enable arm after {ENABLE_TIMEOUT_S}s ({attempts} attempts)")
 
-        self._log(f"Enabled after {attempts} attempts")
+        self._log(f"Enabled after {attempts} attempts ({(time.monotonic() - start) * 1000:.0f}ms)")
 
         # Set motion control mode: CAN control, joint mode, 50% speed
         self._piper.MotionCtrl_2(0x01, 0x01, 50)
@@ -93,23 +114,16 @@ class StandardPiperArm(PiperArmBase):
 
     def _get_joints(self) -> list[float]:
         """Get joint positions in radians."""
-        joints = self._piper.GetArmJointMsgs()
+        joint_state = self._piper.GetArmJointMsgs().joint_state
         # SDK returns millidegrees, convert to radians
-        return [
-            math.radians(joints.joint_state.joint_1 / 1000.0),
-            math.radians(joints.joint_state.joint_2 / 1000.0),
-            math.radians(joints.joint_state.joint_3 / 1000.0),
-            math.radians(joints.joint_state.joint_4 / 1000.0),
-            math.radians(joints.joint_state.joint_5 / 1000.0),
-            math.radians(joints.joint_state.joint_6 / 1000.0),
-        ]
+        return [mdeg * MDEG_TO_RAD for mdeg in JOINT_FIELDS(joint_state)]
 
     def _get_gripper(self) -> float:
         """Get gripper position (0-1 range)."""
         gripper = self._piper.GetArmGripperMsgs()
         # Convert from SDK units (0.001mm) to 0-1 range (0-70mm)
-        pos_mm = gripper.gripper_state.grippers_angle / 1000.0
-        return max(0.0, min(1.0, pos_mm / 70.0))
+        pos = gripper.gripper_state.grippers_angle * UM_TO_GRIPPER
+        return 0.0 if pos < 0.0 else 1.0 if pos > 1.0 else pos
 
     def _send_joint_command(self, positions: list[float], duration: float = 0.0) -> None:
         """Send joint positions in radians.
@@ -119,13 +133,15 @@ class StandardPiperArm(PiperArmBase):
             duration: Ignored (SDK handles timing internally)
         """
         # Convert radians to millidegrees for SDK
-        mdeg = [int(math.degrees(p) * 1000) for p in positions]
+        mdeg = self._mdeg
+        for i, p in enumerate(positions):
+            mdeg[i] = round(p * RAD_TO_MDEG)
         self._piper.JointCtrl(*mdeg)
 
     def _send_gripper_command(self, position: float) -> None:
         """Send gripper position (0-1 range)."""
         # Convert 0-1 to SDK units (0.001mm), range 0-70mm = 0-70000
-        pos_um = int(position * 70000)
+        pos_um = int(position * GRIPPER_RANGE_UM)
         # GripperCtrl(position, effort, mode, set_zero)
         # mode 0x01 = enable, effort 1000 = 1 N·m
         self._piper.GripperCtrl(pos_um, 1000, 0x01, 0)
@@ -4,15 +4,30 @@ Waveshare Piper arm adapter using custom CAN protocol.
 This adapter communicates directly with the Piper arm via the Waveshare
 USB-CAN-A adapter, bypassing piper_control's socketcan requirement.
 """
-import threading
+import functools
+import struct
 import time
 from typing import Optional
 
 import can
 
-from ..base import PiperArmBase, deg2rad, rad2deg
+from ..base import (
+    GRIPPER_RANGE_UM,
+    MDEG_TO_RAD,
+    RAD_TO_MDEG,
+    UM_TO_GRIPPER,
+    PiperArmBase,
+    sleep_until,
+)
 from ..can import WaveshareBus, find_waveshare_port
 
+# Big-endian payloads, compiled once: joint pair (2x int32, 0.001°),
+# gripper feedback position (int32, 0.001mm) and gripper command
+# (position int32, effort uint16, status, set_zero)
+JOINT_PAIR = struct.Struct(">ii")
+GRIPPER_POS = struct.Struct(">i")
+GRIPPER_CTRL = struct.Struct(">iHBB")
+
 
 class WavesharePiperArm(PiperArmBase):
     """
@@ -30,11 +45,25 @@ class WavesharePiperArm(PiperArmBase):
     GRIPPER_COMMAND_ID = 0x159          # Gripper control
     ARM_MOTOR_ENABLE_ID = 0x471         # Motor enable command
 
+    # Only joint (0x2A5-0x2A7) and gripper (0x2A8) feedback is read; the arm's
+    # status and end-pose frames (0x2A1-0x2A4) are dropped before decoding
+    FEEDBACK_FILTERS = [
+        {"can_id": 0x2A5, "can_mask": 0x7FF, "extended": False},
+        {"can_id": 0x2A6, "can_mask": 0x7FE, "extended": False},  # 0x2A6-0x2A7
+        {"can_id": 0x2A8, "can_mask": 0x7FF, "extended": False},
+    ]
+
     # Default inter-message delay (seconds)
     # 5ms matches the SDK rhythm; lower values may drop frames on slower systems
     DEFAULT_MSG_DELAY = 0.005
     # Default burst duration for streaming mode (seconds)
     DEFAULT_STREAM_BURST_S = 0.05
+    # Max feedback frames handled between two command ticks, so a flood of
+    # feedback can't delay the next send
+    FEEDBACK_DRAIN_MAX = 32
+    # Feedback younger than this is reused by _get_joints/_get_gripper, so
+    # back-to-back reads (e.g. the state property) don't each rescan the bus
+    FEEDBACK_MAX_AGE_S = 0.01
 
     def __init__(
         self,
@@ -82,6 +111,37 @@ class WavesharePiperArm(PiperArmBase):
         self._bus: Optional[WaveshareBus] = None
         self._joints = [0.0] * 6  # Cached joint positions (radians)
         self._gripper = 0.0       # Cached gripper position
+        self._feedback_at = float("-inf")  # time.monotonic() of last complete feedback read
+
+        # Feedback decoders by arbitration ID: each joint frame carries 2 joints
+        self._decoders = {
+            self.ARM_JOINT_FEEDBACK_ID_BASE + i: functools.partial(self._decode_joint_pair, i * 2)
+            for i in range(3)
+        }
+        self._decoders[self.GRIPPER_FEEDBACK_ID] = self._decode_gripper
+
+        # Constant frames resent every tick: build once, reuse
+        # Motor enable: byte0=0x07, byte1=0x02 (enable)
+        self._enable_msg = can.Message(
+            arbitration_id=self.ARM_MOTOR_ENABLE_ID,
+            data=bytes([0x07, 0x02, 0, 0, 0, 0, 0, 0]),
+            is_extended_id=False,
+        )
+        self._motion_msgs: dict[int, can.Message] = {}  # By speed_pct
+        # Joint control (0x155-0x157) and gripper frames; payloads are packed in place
+        self._joint_msgs = [
+            can.Message(
+                arbitration_id=self.ARM_JOINT_CTRL_ID_BASE + i,
+                data=bytes(8),
+                is_extended_id=False,
+            )
+            for i in range(3)
+        ]
+        self._gripper_msg = can.Message(
+            arbitration_id=self.GRIPPER_COMMAND_ID,
+            data=bytes(8),
+            is_extended_id=False,
+        )
 
     def _connect(self) -> None:
         if self.port == "auto":
@@ -96,7 +156,16 @@ class WavesharePiperArm(PiperArmBase):
             self.port = port
 
         self._log(f"Connecting via {self.port}...")
-        self._bus = WaveshareBus(channel=self.port, bitrate=1000000)
+        self._bus = WaveshareBus(
+            channel=self.port,
+            bitrate=1000000,
+            can_filters=self.FEEDBACK_FILTERS,
+        )
+        if not self._bus.low_latency:
+            self._log(
+                f"USB latency timer not lowered for {self.port} "
+                f"(try: sudo setserial {self.port} low_latency)"
+            )
         self._enable_arm()
 
     def _disconnect(self) -> None:
@@ -108,25 +177,18 @@ class WavesharePiperArm(PiperArmBase):
         """Initialize arm for CAN control.
 
         Note: The arm requires continuous command sending during movement.
-        This just does initial setup; actual enable happens in _send_command_set.
+        This just does initial setup; actual enable happens in _command_frames.
         """
         # Read initial joint positions
         self._read_feedback(timeout=0.5)
 
         # Send a few enable + mode commands to prepare the arm
-        # Motor enable: byte0=0x07, byte1=0x02 (enable)
+        prepare = self._bus.encode_batch((self._enable_msg, self._motion_msg(0x32)))
+        next_t = time.perf_counter()
         for _ in range(10):
-            self._bus.send(can.Message(
-                arbitration_id=self.ARM_MOTOR_ENABLE_ID,
-                data=bytes([0x07, 0x02, 0, 0, 0, 0, 0, 0]),
-                is_extended_id=False,
-            ))
-            self._bus.send(can.Message(
-                arbitration_id=self.ARM_MOTION_CTRL_2,
-                data=bytes([0x01, 0x01, 0x32, 0, 0, 0, 0, 0]),
-                is_extended_id=False,
-            ))
-            time.sleep(0.02)
+            self._bus.send_encoded(prepare)
+            next_t += 0.02
+            sleep_until(next_t)
         time.sleep(0.1)
 
     def _read_feedback(self, timeout: float = 0.5) -> bool:
@@ -134,81 +196,91 @@ class WavesharePiperArm(PiperArmBase):
 
         Reads feedback messages until we have all 3 joint feedback IDs.
         """
-        deadline = time.time() + timeout
+        deadline = time.monotonic() + timeout
         received = set()
 
-        while time.time() < deadline and len(received) < 3:
+        while time.monotonic() < deadline and len(received) < 3:
             msg = self._bus.recv(timeout=0.05)
             if not msg:
                 continue
-            if self._process_feedback_msg(msg):
-                if 0x2A5 <= msg.arbitration_id <= 0x2A7:
-                    received.add(msg.arbitration_id)
+            if self._process_feedback_msg(msg) and msg.arbitration_id != self.GRIPPER_FEEDBACK_ID:
+                received.add(msg.arbitration_id)
 
-        return len(received) >= 3
+        if len(received) < 3:
+            return False
+        self._feedback_at = time.monotonic()
+        return True
+
+    def _read_feedback_if_stale(self) -> None:
+        """Read feedback unless the last complete read is under FEEDBACK_MAX_AGE_S old."""
+        if time.monotonic() - self._feedback_at > self.FEEDBACK_MAX_AGE_S:
+            self._read_feedback()
+
+    def _drain_feedback(self) -> None:
+        """Process feedback frames already received (up to FEEDBACK_DRAIN_MAX), without blocking."""
+        for _ in range(self.FEEDBACK_DRAIN_MAX):
+            msg = self._bus.recv(timeout=0)
+            if msg is None:
+                return
+            self._process_feedback_msg(msg)
 
     def _process_feedback_msg(self, msg) -> bool:
         """Process a single feedback message. Returns True if it was a feedback msg."""
         if not msg:
             return False
-
-        # Joint feedback messages (0x2A5-0x2A7, each has 2 joints)
-        if 0x2A5 <= msg.arbitration_id <= 0x2A7:
-            idx = (msg.arbitration_id - 0x2A5) * 2
-            if len(msg.data) >= 8:
-                j1 = int.from_bytes(msg.data[0:4], 'big', signed=True) / 1000.0
-                j2 = int.from_bytes(msg.data[4:8], 'big', signed=True) / 1000.0
-                self._joints[idx] = deg2rad(j1)
-                if idx + 1 < 6:
-                    self._joints[idx + 1] = deg2rad(j2)
-            return True
-
-        # Gripper feedback (0x2A8)
-        elif msg.arbitration_id == self.GRIPPER_FEEDBACK_ID:
-            if len(msg.data) >= 4:
-                pos = int.from_bytes(msg.data[0:4], 'big', signed=True)
-                self._gripper = max(0.0, min(1.0, pos / 70000.0))
-            return True
-
-        return False
+        decode = self._decoders.get(msg.arbitration_id)
+        if decode is None:
+            return False
+        decode(msg.data)
+        return True
+
+    def _decode_joint_pair(self, idx: int, data) -> None:
+        """Joint feedback (0x2A5-0x2A7): joints idx and idx+1 in millidegrees."""
+        if len(data) >= 8:
+            j1_raw, j2_raw = JOINT_PAIR.unpack_from(data)
+            self._joints[idx] = j1_raw * MDEG_TO_RAD
+            self._joints[idx + 1] = j2_raw * MDEG_TO_RAD
+
+    def _decode_gripper(self, data) -> None:
+        """Gripper feedback (0x2A8): position in 0.001mm, mapped to 0-1 over 0-70mm."""
+        if len(data) >= 4:
+            pos = GRIPPER_POS.unpack_from(data)[0] * UM_TO_GRIPPER
+            self._gripper = 0.0 if pos < 0.0 else 1.0 if pos > 1.0 else pos
 
     def _get_joints(self) -> list[float]:
-        self._read_feedback()
+        self._read_feedback_if_stale()
         return list(self._joints)
 
     def _get_gripper(self) -> float:
-        self._read_feedback()
+        self._read_feedback_if_stale()
         return self._gripper
 
-    def _send_command_set(self, pos_mdeg: list[int], speed_pct: int = 30) -> None:
-        """Send full command set: enable + motion_ctrl + joint positions.
+    def _motion_msg(self, speed_pct: int) -> can.Message:
+        """Motion control (0x151) frame: CAN mode, joint mode, speed%. Cached per speed."""
+        msg = self._motion_msgs.get(speed_pct)
+        if msg is None:
+            msg = self._motion_msgs[speed_pct] = can.Message(
+                arbitration_id=self.ARM_MOTION_CTRL_2,
+                data=bytes([0x01, 0x01, speed_pct, 0, 0, 0, 0, 0]),
+                is_extended_id=False,
+            )
+        return msg
+
+    def _command_frames(self, pos_mdeg: list[int], speed_pct: int = 30) -> list[can.Message]:
+        """Build the full command set: enable + motion_ctrl + joint positions.
 
         The Piper arm requires all three command types sent together continuously.
+        Joint frames are reused, so encode the result before the next call.
         """
-        # Motor enable: byte0=0x07, byte1=0x02 (enable)
-        self._bus.send(can.Message(
-            arbitration_id=self.ARM_MOTOR_ENABLE_ID,
-            data=bytes([0x07, 0x02, 0, 0, 0, 0, 0, 0]),
-            is_extended_id=False,
-        ))
-
-        # Motion control (0x151): CAN mode, joint mode, speed%
-        self._bus.send(can.Message(
-            arbitration_id=self.ARM_MOTION_CTRL_2,
-            data=bytes([0x01, 0x01, speed_pct, 0, 0, 0, 0, 0]),
-            is_extended_id=False,
-        ))
+        frames = [self._enable_msg, self._motion_msg(speed_pct)]
 
         # Joint positions (0x155-0x157)
-        for i in range(3):
+        for i, msg in enumerate(self._joint_msgs):
             j1 = pos_mdeg[i * 2]
             j2 = pos_mdeg[i * 2 + 1] if i * 2 + 1 < 6 else 0
-            data = j1.to_bytes(4, 'big', signed=True) + j2.to_bytes(4, 'big', signed=True)
-            self._bus.send(can.Message(
-                arbitration_id=self.ARM_JOINT_CTRL_ID_BASE + i,
-                data=data,
-                is_extended_id=False,
-            ))
+            JOINT_PAIR.pack_into(msg.data, 0, j1, j2)
+            frames.append(msg)
+        return frames
 
     def _send_joint_command(self, positions: list[float], duration: float = 0.0, speed_pct: int = 50) -> None:
         """Send joint command to arm.
@@ -218,35 +290,31 @@ class WavesharePiperArm(PiperArmBase):
             duration: Time to send commands (seconds). 0 = single burst (for trajectory streaming)
             speed_pct: Movement speed percentage (1-100)
         """
-        pos_mdeg = [int(rad2deg(p) * 1000) for p in positions]
+        pos_mdeg = [round(p * RAD_TO_MDEG) for p in positions]
+        # Same target for every repeat: encode the frames once
+        payload = self._bus.encode_batch(self._command_frames(pos_mdeg, speed_pct))
+
+        # Sends are paced on absolute deadlines so send time and sleep
+        # overshoot don't stretch the msg_delay period
+        next_t = time.perf_counter()
 
         if duration <= 0:
             # Fast mode: short continuous burst for trajectory streaming
             iterations = max(1, int(round(self.stream_burst_s / self.msg_delay)))
             for _ in range(iterations):
-                self._send_command_set(pos_mdeg, speed_pct)
-                time.sleep(self.msg_delay)
+                self._bus.send_encoded(payload)
+                next_t += self.msg_delay
+                sleep_until(next_t)
             return
 
-        # Blocking mode: continuous commands for duration (for single moves)
-        stop_flag = threading.Event()
-
-        def feedback_reader():
-            while not stop_flag.is_set():
-                msg = self._bus.recv(timeout=0.05)
-                if msg:
-                    self._process_feedback_msg(msg)
-
-        reader_thread = threading.Thread(target=feedback_reader, daemon=True)
-        reader_thread.start()
-
-        start = time.time()
-        while time.time() - start < duration:
-            self._send_command_set(pos_mdeg, speed_pct)
-            time.sleep(self.msg_delay)
-
-        stop_flag.set()
-        reader_thread.join(timeout=0.5)
+        # Blocking mode: continuous commands for duration (for single moves).
+        # Feedback is drained between sends on this thread, no reader thread.
+        end = next_t + duration
+        while next_t < end:
+            self._bus.send_encoded(payload)
+            self._drain_feedback()
+            next_t += self.msg_delay
+            sleep_until(next_t)
 
     def _send_gripper_command(self, position: float, effort: int = 1000) -> None:
         """Send gripper control command (CAN ID 0x159).
@@ -258,15 +326,7 @@ class WavesharePiperArm(PiperArmBase):
             Byte 7: Set zero (0x00=normal)
         """
         # Position: 0.0-1.0 maps to 0-70000 (0-70mm in 0.001mm units)
-        pos = int(position * 70000)
-        data = (
-            pos.to_bytes(4, 'big', signed=True)
-            + effort.to_bytes(2, 'big', signed=False)  # Effort is UNSIGNED
-            + bytes([0x01, 0x00])  # status_code=enable, set_zero=normal
-        )
-        msg = can.Message(
-            arbitration_id=self.GRIPPER_COMMAND_ID,
-            data=data,
-            is_extended_id=False,
-        )
-        self._bus.send(msg)
+        pos = int(position * GRIPPER_RANGE_UM)
+        # Effort is UNSIGNED; status_code=enable, set_zero=normal
+        GRIPPER_CTRL.pack_into(self._gripper_msg.data, 0, pos, effort, 0x01, 0x00)
+        self._bus.send(self._gripper_msg)
@@ -30,31 +30,42 @@ CLI:
     python -m piper.audio video.mp4 --mode ensemble   # Ensemble (snaps by default)
     python -m piper.audio video.mp4 --format template --output schedule.md
 """
-from .analysis import (
-    AudioAnalysis,
-    AnalysisConfig,
-    DetectionMode,
-    analyze_audio,
-    estimate_bpm,
-    detect_change_points,
-    detect_onsets,
-    detect_spectral_contrast_changes,
-    detect_ensemble,
-    snap_to_beats,
-    get_beat_times,
-)
-from .formats import (
-    format_summary,
-    to_json,
-    to_schedule_template,
-    format_timestamp,
-)
-from .downloader import (
-    download_youtube,
-    is_youtube_url,
-    extract_video_id,
-    get_video_title,
-)
+import importlib
+
+# Public name -> submodule. Submodules (and librosa/numpy/yt-dlp behind them)
+# are imported on first attribute access, not when piper.audio is imported.
+_LAZY = {
+    "AudioAnalysis": "analysis",
+    "AnalysisConfig": "analysis",
+    "DetectionMode": "analysis",
+    "analyze_audio": "analysis",
+    "estimate_bpm": "analysis",
+    "detect_change_points": "analysis",
+    "detect_onsets": "analysis",
+    "detect_spectral_contrast_changes": "analysis",
+    "detect_ensemble": "analysis",
+    "snap_to_beats": "analysis",
+    "get_beat_times": "analysis",
+    "format_summary": "formats",
+    "to_json": "formats",
+    "to_schedule_template": "formats",
+    "format_timestamp": "formats",
+    "download_youtube": "downloader",
+    "is_youtube_url": "downloader",
+    "extract_video_id": "downloader",
+    "get_video_title": "downloader",
+}
+
+
+def __getattr__(name: str):
+    """Lazy import audio helpers to avoid importing dependencies until needed."""
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "AudioAnalysis",
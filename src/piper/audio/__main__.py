@@ -18,15 +18,19 @@ Visualization:
 
 Configuration:
     python -m piper.audio video.mp4 --min-gap 2.0 --threshold 90
+    python -m piper.audio video.mp4 --sample-rate 11025   # Faster, ignores >5.5kHz
 
 Audio-only download (faster, smaller):
     python -m piper.audio "https://youtu.be/VIDEO_ID" --audio-only
+
+Re-running on the same file (skips decoding after the first run):
+    python -m piper.audio video.mp4 --audio-cache video/.audio_cache
 """
 import argparse
 import sys
 from pathlib import Path
 
-from .analysis import analyze_audio, AnalysisConfig, DetectionMode
+from .analysis import SAMPLE_RATE, analyze_audio, AnalysisConfig, DetectionMode, _centroid_delta, _load_audio
 from .formats import format_summary, to_json, to_schedule_template
 
 
@@ -88,6 +92,21 @@ def main():
         help="Directory to cache downloaded videos (default: video/)",
     )
 
+    parser.add_argument(
+        "--audio-cache",
+        type=Path,
+        metavar="DIR",
+        help="Cache decoded audio here to skip decoding on re-runs (default: off)",
+    )
+
+    parser.add_argument(
+        "--sample-rate",
+        type=int,
+        default=SAMPLE_RATE,
+        metavar="HZ",
+        help=f"Resample audio to this rate before analysis; 11025 is ~2x faster (default: {SAMPLE_RATE})",
+    )
+
     parser.add_argument(
         "--mode",
         choices=["spectral", "onsets", "beats", "ensemble", "combined"],
@@ -135,6 +154,9 @@ def main():
         weight_spectral=weights[0],
         weight_contrast=weights[1],
         weight_onset=weights[2],
+        cache_dir=args.audio_cache,
+        sample_rate=args.sample_rate,
+        keep_debug=args.visualize,
     )
 
     try:
@@ -217,18 +239,17 @@ def visualize(path: str, analysis, config: AnalysisConfig):
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    y, sr = librosa.load(path)
+    # Reuse the samples analyze_audio already loaded instead of decoding again
+    if analysis.debug is not None:
+        y, sr = analysis.debug["y"], analysis.debug["sr"]
+    else:
+        y, sr = _load_audio(path, config)
 
-    centroid = librosa.feature.spectral_centroid(
-        y=y, sr=sr, hop_length=config.hop_length
-    )[0]
+    centroid, delta, threshold = _centroid_delta(y, sr, config)
     times = librosa.frames_to_time(
         range(len(centroid)), sr=sr, hop_length=config.hop_length
     )
-
-    delta = np.abs(np.diff(centroid))
     delta_times = times[:-1]
-    threshold = np.percentile(delta, config.percentile_threshold)
 
     fig, axes = plt.subplots(3, 1, figsize=(14, 10), sharex=True)
 
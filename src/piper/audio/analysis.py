@@ -4,9 +4,18 @@ Audio analysis for choreography timing.
 Provides BPM estimation and multi-feature change point detection
 for creating synchronized dance schedules.
 """
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+# librosa.load()'s default rate; 11025 halves STFT work for BPM and
+# centroid changes, at the cost of ignoring content above 5.5 kHz
+SAMPLE_RATE = 22050
 
 
 class DetectionMode(Enum):
@@ -18,7 +27,7 @@ class DetectionMode(Enum):
     COMBINED = "combined"      # Ensemble + beat-aligned
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioAnalysis:
     """Results of audio analysis."""
     source: str
@@ -28,9 +37,10 @@ class AudioAnalysis:
     timestamps: List[float] = field(default_factory=list)
     detection_mode: str = "combined"
     beat_times: List[float] = field(default_factory=list)
+    debug: Optional[Dict[str, Any]] = None  # {"y", "sr"} when config.keep_debug
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisConfig:
     """Configuration for analysis."""
     min_gap_s: float = 1.5
@@ -42,6 +52,9 @@ class AnalysisConfig:
     weight_spectral: float = 0.4
     weight_contrast: float = 0.3
     weight_onset: float = 0.3
+    cache_dir: Optional[Path] = None  # Decoded audio cache; None disables it
+    sample_rate: int = SAMPLE_RATE     # Audio is loaded mono, resampled to this
+    keep_debug: bool = False           # Keep loaded samples on the result for plotting
 
 
 def _load_librosa():
@@ -84,27 +97,24 @@ def analyze_audio(path: str, config: Optional[AnalysisConfig] = None) -> AudioAn
     if config is None:
         config = AnalysisConfig()
 
-    y, sr = librosa.load(path)
+    y, sr = _load_audio(path, config)
     duration_s = len(y) / sr
 
-    bpm = estimate_bpm(y, sr)
-    beat_times = get_beat_times(y, sr)
+    bpm, beat_times = _track_beats(y, sr)
 
-    if config.mode == DetectionMode.SPECTRAL:
-        timestamps = detect_change_points(y, sr, config)
-    elif config.mode == DetectionMode.ONSETS:
-        timestamps = detect_onsets(y, sr, config)
-    elif config.mode == DetectionMode.BEATS:
+    detectors = {
+        DetectionMode.SPECTRAL: detect_change_points,
+        DetectionMode.ONSETS: detect_onsets,
+        DetectionMode.ENSEMBLE: detect_ensemble,
+        DetectionMode.COMBINED: detect_ensemble,
+    }
+    if config.mode == DetectionMode.BEATS:
         timestamps = _filter_min_gap(beat_times, config.min_gap_s)
-    elif config.mode == DetectionMode.ENSEMBLE:
-        timestamps = detect_ensemble(y, sr, config)
-    elif config.mode == DetectionMode.COMBINED:
-        timestamps = detect_ensemble(y, sr, config)
-        timestamps = snap_to_beats(timestamps, beat_times, config.beat_snap_tolerance_s)
     else:
-        timestamps = detect_change_points(y, sr, config)
+        timestamps = detectors.get(config.mode, detect_change_points)(y, sr, config)
 
-    if config.snap_to_beats and config.mode != DetectionMode.COMBINED:
+    # COMBINED is ensemble detection that always snaps; snap at most once
+    if config.snap_to_beats or config.mode == DetectionMode.COMBINED:
         timestamps = snap_to_beats(timestamps, beat_times, config.beat_snap_tolerance_s)
 
     return AudioAnalysis(
@@ -115,9 +125,45 @@ def analyze_audio(path: str, config: Optional[AnalysisConfig] = None) -> AudioAn
         timestamps=timestamps,
         detection_mode=config.mode.value,
         beat_times=beat_times,
+        debug={"y": y, "sr": sr} if config.keep_debug else None,
     )
 
 
+def _load_audio(path: str, config: AnalysisConfig):
+    """
+    Load audio as mono at config.sample_rate, reusing a decoded copy when cached.
+
+    Decoding and resampling (especially from video containers) dominate
+    repeated runs on the same file. With config.cache_dir set, the samples
+    are stored there as .npy, keyed by path, mtime, size and sample rate, and
+    later loads memory-map that file instead of decoding again.
+    """
+    librosa = _load_librosa()
+
+    if config.cache_dir is None:
+        return librosa.load(path, sr=config.sample_rate, mono=True)
+
+    np = _load_numpy()
+
+    stat = os.stat(path)
+    key = hashlib.blake2b(
+        f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}:{config.sample_rate}".encode(),
+        digest_size=8,
+    ).hexdigest()
+    cached = Path(config.cache_dir) / f"{key}.npy"
+    if cached.exists():
+        return np.load(cached, mmap_mode="r"), config.sample_rate
+
+    y, sr = librosa.load(path, sr=config.sample_rate, mono=True)
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    # Write aside and rename so an interrupted run never leaves a partial file
+    partial = cached.with_suffix(".partial")
+    with open(partial, "wb") as f:
+        np.save(f, y)
+    os.replace(partial, cached)
+    return y, sr
+
+
 def estimate_bpm(y, sr: int) -> float:
     """
     Estimate tempo using librosa beat tracking.
@@ -129,16 +175,28 @@ def estimate_bpm(y, sr: int) -> float:
     Returns:
         Estimated BPM (rounded to 1 decimal place)
     """
+    return _track_beats(y, sr)[0]
+
+
+def _track_beats(y, sr: int):
+    """
+    Run librosa beat tracking once, returning (BPM, beat times).
+
+    beat_track yields tempo and beat frames from the same pass, so
+    analyze_audio takes both here instead of tracking twice through
+    estimate_bpm and get_beat_times.
+    """
     librosa = _load_librosa()
     np = _load_numpy()
 
-    tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
+    tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
     if isinstance(tempo, np.ndarray):
         tempo = float(tempo[0])
-    return round(tempo, 1)
+    beat_times = librosa.frames_to_time(beat_frames, sr=sr)
+    return round(tempo, 1), beat_times.tolist()
 
 
-def detect_change_points(y, sr: int, config: AnalysisConfig) -> List[float]:
+def detect_change_points(y, sr: int, config: AnalysisConfig, S=None) -> List[float]:
     """
     Detect brightness jump timestamps using spectral centroid delta.
 
@@ -149,6 +207,7 @@ def detect_change_points(y, sr: int, config: AnalysisConfig) -> List[float]:
         y: Audio time series (numpy array)
         sr: Sample rate
         config: Analysis configuration
+        S: Optional precomputed magnitude spectrogram (see _magnitude_spectrogram)
 
     Returns:
         List of timestamps in seconds
@@ -156,12 +215,7 @@ def detect_change_points(y, sr: int, config: AnalysisConfig) -> List[float]:
     librosa = _load_librosa()
     np = _load_numpy()
 
-    centroid = librosa.feature.spectral_centroid(
-        y=y, sr=sr, hop_length=config.hop_length
-    )[0]
-
-    delta = np.abs(np.diff(centroid))
-    threshold = np.percentile(delta, config.percentile_threshold)
+    _, delta, threshold = _centroid_delta(y, sr, config, S=S)
 
     frames = np.where(delta > threshold)[0]
     times = librosa.frames_to_time(frames, sr=sr, hop_length=config.hop_length)
@@ -170,15 +224,34 @@ def detect_change_points(y, sr: int, config: AnalysisConfig) -> List[float]:
     return filtered
 
 
+def _centroid_delta(y, sr: int, config: AnalysisConfig, S=None):
+    """
+    Spectral centroid, its absolute frame-to-frame delta, and the delta threshold.
+
+    Shared by detect_change_points and the CLI's --visualize plot.
+
+    Returns:
+        Tuple of (centroid, delta, threshold); delta has one fewer frame
+    """
+    librosa = _load_librosa()
+    np = _load_numpy()
+
+    centroid = librosa.feature.spectral_centroid(
+        y=y, sr=sr, S=S, hop_length=config.hop_length
+    )[0]
+    delta = np.abs(np.diff(centroid))
+    threshold = np.percentile(delta, config.percentile_threshold)
+    return centroid, delta, threshold
+
+
 def _filter_min_gap(times: List[float], min_gap_s: float) -> List[float]:
     """Filter timestamps to ensure minimum gap between consecutive points."""
-    if not times:
-        return []
-
-    result = [times[0]]
-    for t in times[1:]:
-        if t - result[-1] >= min_gap_s:
+    result = []
+    last = float("-inf")
+    for t in times:
+        if t - last >= min_gap_s:
             result.append(t)
+            last = t
     return result
 
 
@@ -193,11 +266,7 @@ def get_beat_times(y, sr: int) -> List[float]:
     Returns:
         List of beat timestamps in seconds
     """
-    librosa = _load_librosa()
-
-    _, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
-    beat_times = librosa.frames_to_time(beat_frames, sr=sr)
-    return beat_times.tolist()
+    return _track_beats(y, sr)[1]
 
 
 def detect_onsets(y, sr: int, config: AnalysisConfig) -> List[float]:
@@ -223,7 +292,7 @@ def detect_onsets(y, sr: int, config: AnalysisConfig) -> List[float]:
     return _filter_min_gap(times.tolist(), config.min_gap_s)
 
 
-def detect_spectral_contrast_changes(y, sr: int, config: AnalysisConfig) -> List[float]:
+def detect_spectral_contrast_changes(y, sr: int, config: AnalysisConfig, S=None) -> List[float]:
     """
     Detect changes in spectral contrast.
 
@@ -234,6 +303,7 @@ def detect_spectral_contrast_changes(y, sr: int, config: AnalysisConfig) -> List
         y: Audio time series (numpy array)
         sr: Sample rate
         config: Analysis configuration
+        S: Optional precomputed magnitude spectrogram (see _magnitude_spectrogram)
 
     Returns:
         List of timestamps in seconds
@@ -242,7 +312,7 @@ def detect_spectral_contrast_changes(y, sr: int, config: AnalysisConfig) -> List
     np = _load_numpy()
 
     contrast = librosa.feature.spectral_contrast(
-        y=y, sr=sr, hop_length=config.hop_length
+        y=y, sr=sr, S=S, hop_length=config.hop_length
     )
     contrast_mean = np.mean(contrast, axis=0)
     delta = np.abs(np.diff(contrast_mean))
@@ -271,37 +341,52 @@ def detect_ensemble(y, sr: int, config: AnalysisConfig) -> List[float]:
     """
     np = _load_numpy()
 
-    spectral_times = detect_change_points(y, sr, config)
-    contrast_times = detect_spectral_contrast_changes(y, sr, config)
-    onset_times = detect_onsets(y, sr, config)
+    # Onsets need their own mel spectrogram; compute it on a worker while
+    # this thread runs the STFT that centroid and contrast share. Both are
+    # dominated by FFT/BLAS calls that release the GIL.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        onset_future = executor.submit(detect_onsets, y, sr, config)
+        S = _magnitude_spectrogram(y, config)
+        spectral_times = detect_change_points(y, sr, config, S=S)
+        contrast_times = detect_spectral_contrast_changes(y, sr, config, S=S)
+        onset_times = onset_future.result()
 
-    all_times = set(spectral_times + contrast_times + onset_times)
+    candidates = np.unique(np.concatenate((spectral_times, contrast_times, onset_times)))
 
     tolerance = config.min_gap_s / 2
-    scored_times = []
-
-    for t in sorted(all_times):
-        score = 0.0
-        if _has_nearby(t, spectral_times, tolerance):
-            score += config.weight_spectral
-        if _has_nearby(t, contrast_times, tolerance):
-            score += config.weight_contrast
-        if _has_nearby(t, onset_times, tolerance):
-            score += config.weight_onset
-        scored_times.append((t, score))
+    scores = (
+        config.weight_spectral * _has_nearby(candidates, spectral_times, tolerance)
+        + config.weight_contrast * _has_nearby(candidates, contrast_times, tolerance)
+        + config.weight_onset * _has_nearby(candidates, onset_times, tolerance)
+    )
 
     threshold = max(config.weight_spectral, config.weight_contrast, config.weight_onset)
-    selected = [t for t, score in scored_times if score >= threshold]
+    selected = candidates[scores >= threshold].tolist()
 
     return _filter_min_gap(selected, config.min_gap_s)
 
 
-def _has_nearby(target: float, times: List[float], tolerance: float) -> bool:
-    """Check if any time in the list is within tolerance of target."""
-    for t in times:
-        if abs(t - target) <= tolerance:
-            return True
-    return False
+def _magnitude_spectrogram(y, config: AnalysisConfig):
+    """Magnitude STFT as spectral_centroid/spectral_contrast compute it by default."""
+    librosa = _load_librosa()
+    np = _load_numpy()
+
+    return np.abs(librosa.stft(y, hop_length=config.hop_length))
+
+
+def _has_nearby(targets, times: List[float], tolerance: float):
+    """Boolean array: whether any time in the sorted list is within tolerance of each target."""
+    np = _load_numpy()
+
+    if not times:
+        return np.zeros(len(targets), dtype=bool)
+
+    # Only the neighbours either side of each insertion point can be nearest
+    times_arr = np.asarray(times, dtype=np.float64)
+    idx = np.searchsorted(times_arr, targets)
+    left = times_arr[np.clip(idx - 1, 0, len(times_arr) - 1)]
+    right = times_arr[np.clip(idx, 0, len(times_arr) - 1)]
+    return np.minimum(np.abs(left - targets), np.abs(right - targets)) <= tolerance
 
 
 def snap_to_beats(
@@ -318,14 +403,21 @@ def snap_to_beats(
     Returns:
         List of timestamps, snapped to beats where possible
     """
-    if not beat_times:
+    if not beat_times or not times:
         return times
 
-    result = []
-    for t in times:
-        nearest_beat = min(beat_times, key=lambda b: abs(b - t))
-        if abs(nearest_beat - t) <= tolerance:
-            result.append(nearest_beat)
-        else:
-            result.append(t)
-    return result
+    np = _load_numpy()
+
+    # Beats are sorted: the nearest one is either side of the insertion point
+    beats = np.asarray(beat_times, dtype=np.float64)
+    times_arr = np.asarray(times, dtype=np.float64)
+    idx = np.searchsorted(beats, times_arr)
+    left = beats[np.clip(idx - 1, 0, len(beats) - 1)]
+    right = beats[np.clip(idx, 0, len(beats) - 1)]
+    dist_left = np.abs(left - times_arr)
+    dist_right = np.abs(right - times_arr)
+
+    # Ties go to the earlier beat, as min() over beat_times did
+    nearest = np.where(dist_left <= dist_right, left, right)
+    dist = np.minimum(dist_left, dist_right)
+    return np.where(dist <= tolerance, nearest, times_arr).tolist()
@@ -10,6 +10,15 @@ from typing import Optional, Tuple
 
 DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent.parent / "video"
 
+# watch?v=, youtu.be/ and shorts/ URLs, with optional scheme and www.
+YOUTUBE_URL_RE = re.compile(
+    r'(https?://)?(www\.)?(youtube\.com/watch\?v=|youtu\.be/|youtube\.com/shorts/)'
+)
+VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be/|shorts/)([a-zA-Z0-9_-]{11})')
+
+# Extensions a finished download can have, in lookup order
+CACHED_EXTENSIONS = ('.mp4', '.webm', '.mkv', '.m4a', '.mp3')
+
 
 def _load_yt_dlp():
     """Lazy import yt-dlp with clear error message."""
@@ -25,20 +34,24 @@ def _load_yt_dlp():
 
 def is_youtube_url(url: str) -> bool:
     """Check if URL is a YouTube URL."""
-    youtube_patterns = [
-        r'(https?://)?(www\.)?youtube\.com/watch\?v=',
-        r'(https?://)?(www\.)?youtu\.be/',
-        r'(https?://)?(www\.)?youtube\.com/shorts/',
-    ]
-    return any(re.match(pattern, url) for pattern in youtube_patterns)
+    return YOUTUBE_URL_RE.match(url) is not None
 
 
 def extract_video_id(url: str) -> Optional[str]:
     """Extract YouTube video ID from URL."""
-    match = re.search(r'(?:v=|youtu\.be/|shorts/)([a-zA-Z0-9_-]{11})', url)
+    match = VIDEO_ID_RE.search(url)
     return match.group(1) if match else None
 
 
+def _find_cached(cache_dir: Path, video_id: str) -> Optional[Path]:
+    """Return the downloaded file for video_id in cache_dir, if any."""
+    for ext in CACHED_EXTENSIONS:
+        path = cache_dir / f"{video_id}{ext}"
+        if path.exists():
+            return path
+    return None
+
+
 def download_youtube(
     url: str,
     cache_dir: Optional[Path] = None,
@@ -68,10 +81,9 @@ def download_youtube(
     if not video_id:
         raise ValueError(f"Could not extract video ID from URL: {url}")
 
-    for ext in ['.mp4', '.webm', '.mkv', '.m4a', '.mp3']:
-        cached = cache_dir / f"{video_id}{ext}"
-        if cached.exists():
-            return cached, True
+    cached = _find_cached(cache_dir, video_id)
+    if cached:
+        return cached, True
 
     output_template = str(cache_dir / f"{video_id}.%(ext)s")
 
@@ -99,12 +111,7 @@ def download_youtube(
             ext = info.get('ext', 'mp4')
             downloaded = cache_dir / f"{video_id}.{ext}"
 
-    for ext in ['.mp4', '.webm', '.mkv', '.m4a', '.mp3']:
-        possible = cache_dir / f"{video_id}{ext}"
-        if possible.exists():
-            return possible, False
-
-    return downloaded, False
+    return _find_cached(cache_dir, video_id) or downloaded, False
 
 
 def get_video_title(url: str) -> Optional[str]:
@@ -3,7 +3,9 @@ Piper Arm base classes and utilities.
 
 This module contains shared code for all adapter implementations:
 - ArmState dataclass
-- deg2rad/rad2deg helpers
+- deg2rad/rad2deg helpers, MDEG_TO_RAD/RAD_TO_MDEG for CAN/SDK joint units
+- GRIPPER_RANGE_UM/UM_TO_GRIPPER for the 0-1 gripper scale
+- sleep_until deadline helper for fixed-rate send loops
 - PiperArmBase abstract base class
 """
 import math
@@ -14,12 +16,40 @@ from dataclasses import dataclass
 
 def deg2rad(degrees: float) -> float:
     """Convert degrees to radians."""
-    return degrees * math.pi / 180.0
+    return math.radians(degrees)
 
 
 def rad2deg(radians: float) -> float:
     """Convert radians to degrees."""
-    return radians * 180.0 / math.pi
+    return math.degrees(radians)
+
+
+# Joints travel over CAN / the SDK in millidegrees. Decode with a multiply and
+# encode with round(rad * RAD_TO_MDEG): every millidegree survives the round
+# trip exactly, so read-modify-write moves don't nudge untouched joints.
+MDEG_TO_RAD = math.pi / 180000.0
+RAD_TO_MDEG = 180000.0 / math.pi
+
+# Gripper travel is 0-70mm, carried in 0.001mm units; 0-1 maps onto it
+GRIPPER_RANGE_UM = 70000
+UM_TO_GRIPPER = 1.0 / GRIPPER_RANGE_UM
+
+
+# sleep() can overshoot by a scheduler tick, so the last stretch is spun
+SPIN_S = 0.0005
+
+
+def sleep_until(deadline: float) -> None:
+    """Sleep until a time.perf_counter() deadline.
+
+    Sleeps most of the slack, then yields in a loop for the final SPIN_S so
+    fixed-rate loops hold their period instead of drifting by sleep overshoot.
+    """
+    slack = deadline - time.perf_counter()
+    if slack > SPIN_S:
+        time.sleep(slack - SPIN_S)
+    while time.perf_counter() < deadline:
+        time.sleep(0)  # Releases the GIL while spinning
 
 
 @dataclass
@@ -152,15 +182,15 @@ class PiperArmBase(ABC):
     def print_state(self) -> None:
         """Print current joint positions."""
         s = self.state
-        print("Joint positions:")
-        for i, j in enumerate(s.joints):
-            print(f"  Joint {i+1}: {rad2deg(j):+7.2f}°")
-        print(f"  Gripper: {s.gripper:.2f}")
+        lines = ["Joint positions:"]
+        lines.extend(f"  Joint {i+1}: {rad2deg(j):+7.2f}°" for i, j in enumerate(s.joints))
+        lines.append(f"  Gripper: {s.gripper:.2f}")
+        print("\n".join(lines))
 
     def wait(self, duration: float) -> None:
         """Wait for specified duration. Override for simulation to step physics."""
         if duration > 0:
-            time.sleep(duration)
+            sleep_until(time.perf_counter() + duration)
 
     def __enter__(self):
         self.connect()
@@ -18,7 +18,10 @@ References:
     - https://www.waveshare.com/wiki/USB-CAN-A
     - https://github.com/RajithaRanasinghe/Python-Class-for-Waveshare-USB-CAN-A
 """
+import functools
 import glob
+import os
+import selectors
 import struct
 import threading
 import time
@@ -34,6 +37,13 @@ FRAME_END = 0x55
 TYPE_STANDARD = 0xC0  # bit5=0, bit4=0
 TYPE_EXTENDED = 0xE0  # bit5=1, bit4=0
 TYPE_REMOTE = 0x10    # bit4=1
+# Frame header: start byte, type byte, then the ID (little-endian)
+STD_HEADER = struct.Struct('<BBH')
+EXT_HEADER = struct.Struct('<BBI')
+FRAME_END_BYTE = bytes([FRAME_END])
+# Frame bytes besides data: AA + type + ID (2 or 4) + 55
+FRAME_OVERHEAD_STD = 5
+FRAME_OVERHEAD_EXT = 7
 
 # CAN speeds (index used in settings command)
 CAN_SPEEDS = {
@@ -51,6 +61,9 @@ CAN_SPEEDS = {
     5000: 0x0C,
 }
 
+# USB-serial drivers hold received bytes for up to latency_timer ms (16 by default)
+USB_SERIAL_SYSFS = "/sys/bus/usb-serial/devices"
+
 
 class WaveshareBus(BusABC):
     """
@@ -63,11 +76,15 @@ class WaveshareBus(BusABC):
         bus.shutdown()
     """
 
+    # (can_id, can_mask, extended) tuples from set_filters(); None = accept all
+    _id_filters: Optional[list[tuple[int, int, Optional[bool]]]] = None
+
     def __init__(
         self,
         channel: str,
         bitrate: int = 1000000,
         serial_baudrate: int = 2000000,
+        low_latency: bool = True,
         **kwargs
     ):
         """
@@ -77,6 +94,7 @@ class WaveshareBus(BusABC):
             channel: Serial port (e.g., '/dev/ttyUSB0', '/dev/ttyUSB1')
             bitrate: CAN bus bitrate (default 1000000 for Piper arm)
             serial_baudrate: Serial port baudrate (default 2000000)
+            low_latency: Lower the USB-serial latency timer to 1ms (Linux, best effort)
         """
         super().__init__(channel=channel, **kwargs)
 
@@ -94,13 +112,98 @@ class WaveshareBus(BusABC):
             timeout=0.1,
         )
 
+        # False if the USB latency timer is still at its (slow) default
+        self.low_latency = self._enable_low_latency() if low_latency else False
+
         # Buffer for incoming data
         self._recv_buffer = bytearray()
         self._recv_lock = threading.Lock()
 
+        # Wake on tty readiness instead of re-arming the serial timeout per read
+        self._selector = self._make_selector()
+
         # Configure CAN speed
         self._configure_speed(bitrate)
 
+    def _enable_low_latency(self) -> bool:
+        """Minimize USB-serial receive latency.
+
+        Sets ASYNC_LOW_LATENCY on the tty and writes 1 to the driver's sysfs
+        latency_timer (FTDI-style drivers), which otherwise delays every
+        feedback frame by up to 16ms. Both steps are best effort.
+
+        Returns:
+            False if the driver has a latency timer that could not be lowered
+            (usually missing write access to sysfs), True otherwise
+        """
+        try:
+            self._ser.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError, ValueError, OSError):
+            pass
+
+        tty_name = os.path.basename(os.path.realpath(self.channel))
+        timer_path = os.path.join(USB_SERIAL_SYSFS, tty_name, "latency_timer")
+        if not os.path.exists(timer_path):
+            return True
+        try:
+            with open(timer_path, "w") as f:
+                f.write("1\n")
+            return True
+        except OSError:
+            return False
+
+    def _make_selector(self) -> Optional[selectors.BaseSelector]:
+        """Register the serial fd for read readiness, or None if it has no fd."""
+        try:
+            selector = selectors.DefaultSelector()
+            selector.register(self._ser.fileno(), selectors.EVENT_READ)
+            return selector
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def fileno(self) -> int:
+        """File descriptor of the serial port, for select() or python-can's Notifier."""
+        return self._ser.fileno()
+
+    def _read_available(self, timeout: Optional[float]) -> bytes:
+        """Wait up to timeout (None = forever) for serial data and return what is buffered."""
+        if self._selector is None:
+            # read(n) blocks until n bytes or the timeout, so size reads to
+            # what is queued rather than waiting out a fixed 256-byte read
+            waiting = self._ser.in_waiting
+            if waiting:
+                return self._ser.read(waiting)
+            self._ser.timeout = 0.1 if timeout is None else min(timeout, 0.1)
+            first = self._ser.read(1)
+            waiting = self._ser.in_waiting if first else 0
+            return first + self._ser.read(waiting) if waiting else first
+        if not self._selector.select(timeout):
+            return b""
+        return self._ser.read(self._ser.in_waiting or 1)
+
+    def _apply_filters(self, filters) -> None:
+        """Prepare filters so rejected frames are dropped before building a Message.
+
+        The adapter itself does not filter, so this is the earliest point
+        unwanted traffic can be discarded.
+        """
+        if not filters:
+            self._id_filters = None
+            return
+        self._id_filters = [
+            (f["can_id"] & f["can_mask"], f["can_mask"], f.get("extended"))
+            for f in filters
+        ]
+
+    def _id_matches(self, arb_id: int, is_extended: bool) -> bool:
+        """Check an arbitration ID against the prepared filters."""
+        for can_id, can_mask, extended in self._id_filters:
+            if extended is not None and extended != is_extended:
+                continue
+            if arb_id & can_mask == can_id:
+                return True
+        return False
+
     def _configure_speed(self, bitrate: int):
         """Send settings command to configure CAN speed."""
         if bitrate not in CAN_SPEEDS:
@@ -132,21 +235,9 @@ class WaveshareBus(BusABC):
             type_byte |= TYPE_REMOTE
         type_byte |= len(msg.data) & 0x0F
 
-        frame = bytearray([FRAME_START, type_byte])
-
-        # Add ID (little-endian)
-        if msg.is_extended_id:
-            frame.extend(struct.pack('<I', msg.arbitration_id))
-        else:
-            frame.extend(struct.pack('<H', msg.arbitration_id))
-
-        # Add data
-        frame.extend(msg.data)
-
-        # End byte
-        frame.append(FRAME_END)
-
-        return bytes(frame)
+        # Start, type and little-endian ID in one pack, then data and end byte
+        header = EXT_HEADER if msg.is_extended_id else STD_HEADER
+        return header.pack(FRAME_START, type_byte, msg.arbitration_id) + msg.data + FRAME_END_BYTE
 
     def _decode_frame(self, data: bytes) -> Optional[Message]:
         """Decode a Waveshare serial frame to CAN message."""
@@ -171,6 +262,9 @@ class WaveshareBus(BusABC):
             arb_id = struct.unpack('<H', data[2:4])[0]
             data_start = 4
 
+        if self._id_filters is not None and not self._id_matches(arb_id, is_extended):
+            return None
+
         # Extract data
         data_bytes = data[data_start:-1][:dlc]
 
@@ -184,9 +278,27 @@ class WaveshareBus(BusABC):
 
     def send(self, msg: Message, timeout: Optional[float] = None) -> None:
         """Send a CAN message."""
-        frame = self._encode_frame(msg)
-        self._ser.write(frame)
-        self._ser.flush()
+        self._ser.write(self._encode_frame(msg))
+
+    def send_batch(self, msgs) -> None:
+        """Send several CAN messages with a single serial write.
+
+        One USB transfer instead of one per frame; the adapter splits the
+        stream back into frames on the bus in order.
+        """
+        self.send_encoded(self.encode_batch(msgs))
+
+    def encode_batch(self, msgs) -> bytes:
+        """Encode messages into one serial payload for send_encoded().
+
+        Lets callers that resend the same frames every tick encode them once.
+        """
+        return b"".join(map(self._encode_frame, msgs))
+
+    def send_encoded(self, data: bytes) -> None:
+        """Write frames already encoded by encode_batch() in a single write."""
+        if data:
+            self._ser.write(data)
 
     def _recv_internal(self, timeout: Optional[float]) -> tuple[Optional[Message], bool]:
         """
@@ -195,55 +307,70 @@ class WaveshareBus(BusABC):
         Returns:
             Tuple of (message or None, filtered: bool)
         """
-        deadline = time.time() + (timeout if timeout else 0)
+        deadline = None if timeout is None else time.monotonic() + timeout
 
+        buf = self._recv_buffer
         with self._recv_lock:
             while True:
-                # Try to find a complete frame in buffer
-                start_idx = self._recv_buffer.find(FRAME_START)
-                if start_idx >= 0:
-                    # Discard anything before start
+                # Parse every complete frame already buffered. Consumed bytes
+                # are deleted from the front, which bytearray does without
+                # copying the remainder.
+                while True:
+                    start_idx = buf.find(FRAME_START)
+                    if start_idx < 0:
+                        buf.clear()
+                        break
                     if start_idx > 0:
-                        self._recv_buffer = self._recv_buffer[start_idx:]
-
-                    # Look for end byte
-                    end_idx = self._recv_buffer.find(FRAME_END, 1)
-                    if end_idx >= 0:
-                        # Extract frame
-                        frame_data = bytes(self._recv_buffer[:end_idx + 1])
-                        self._recv_buffer = self._recv_buffer[end_idx + 1:]
-
-                        msg = self._decode_frame(frame_data)
-                        if msg:
-                            return msg, False
-
-                # Read more data from serial
-                if timeout is not None and time.time() >= deadline:
-                    return None, False
-
-                remaining = deadline - time.time() if timeout else 0.1
-                if remaining <= 0 and timeout is not None:
-                    return None, False
-
-                self._ser.timeout = min(remaining, 0.1)
-                chunk = self._ser.read(256)
+                        del buf[:start_idx]
+                    if len(buf) < 2:
+                        break
+
+                    # Frame length comes from the type byte, so 0x55 bytes
+                    # inside ID or data can't end the frame early
+                    type_byte = buf[1]
+                    dlc = type_byte & 0x0F
+                    if dlc > 8:
+                        del buf[:1]  # Not a frame start, resync on the next 0xAA
+                        continue
+                    frame_len = (FRAME_OVERHEAD_EXT if type_byte & 0x20 else FRAME_OVERHEAD_STD) + dlc
+                    if len(buf) < frame_len:
+                        break
+                    if buf[frame_len - 1] != FRAME_END:
+                        del buf[:1]
+                        continue
+
+                    frame_data = bytes(buf[:frame_len])
+                    del buf[:frame_len]
+                    msg = self._decode_frame(frame_data)
+                    if msg:
+                        return msg, self._id_filters is not None
+
+                # Read more data from serial (timeout=0 still polls once)
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                chunk = self._read_available(remaining)
                 if chunk:
-                    self._recv_buffer.extend(chunk)
-                elif timeout is not None and time.time() >= deadline:
+                    buf.extend(chunk)
+                elif deadline is not None and time.monotonic() >= deadline:
                     return None, False
 
     def shutdown(self) -> None:
         """Close the serial port."""
         super().shutdown()
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
         if self._ser and self._ser.is_open:
+            self._ser.flush()  # Let queued frames reach the adapter before closing
             self._ser.close()
 
 
-def find_all_waveshare_ports() -> list[str]:
-    """Find all available Waveshare USB-CAN-A adapter serial ports.
+@functools.lru_cache(maxsize=1)
+def _probe_serial_ports() -> tuple[str, ...]:
+    """Probe candidate serial ports once per process.
 
-    Returns:
-        List of serial port paths that can be opened at 2000000 baud.
+    Opening each port is the slow part of detection, and detect_adapter,
+    create_arm and the dual-arm port resolver all scan the same devices.
+    Call _probe_serial_ports.cache_clear() after hotplugging an adapter.
     """
     found = []
     for pattern in ['/dev/ttyUSB*', '/dev/ttyACM*']:
@@ -255,7 +382,16 @@ def find_all_waveshare_ports() -> list[str]:
                 found.append(port)
             except (serial.SerialException, OSError):
                 continue
-    return found
+    return tuple(found)
+
+
+def find_all_waveshare_ports() -> list[str]:
+    """Find all available Waveshare USB-CAN-A adapter serial ports.
+
+    Returns:
+        List of serial port paths that can be opened at 2000000 baud.
+    """
+    return list(_probe_serial_ports())
 
 
 def find_waveshare_port(exclude: Optional[list[str]] = None) -> Optional[str]:
@@ -268,15 +404,7 @@ def find_waveshare_port(exclude: Optional[list[str]] = None) -> Optional[str]:
         First available serial port path, or None if not found.
     """
     exclude_set = set(exclude) if exclude else set()
-    for pattern in ['/dev/ttyUSB*', '/dev/ttyACM*']:
-        ports = sorted(glob.glob(pattern))
-        for port in ports:
-            if port in exclude_set:
-                continue
-            try:
-                ser = serial.Serial(port, 2000000, timeout=0.5)
-                ser.close()
-                return port
-            except (serial.SerialException, OSError):
-                continue
+    for port in _probe_serial_ports():
+        if port not in exclude_set:
+            return port
     return None
@@ -32,7 +32,7 @@ from pathlib import Path
 from typing import Optional
 
 from . import load_choreography
-from .script import Checkpoint
+from .script import Checkpoint, load_poses
 from .trajectory import compile_trajectory, compile_dual_trajectory
 from .runner import run_trajectory, run_dual_trajectory
 from .startup import prepend_startup_sequence, STARTUP_DURATION_S, STARTUP_SETTLE_S, STARTUP_J6_OFFSET
@@ -399,8 +399,10 @@ def run_dual(
             print(f"Error: {name} schedule file not found: {path}", file=sys.stderr)
             sys.exit(1)
 
-    he_choreo = load_choreography(poses_path, he_path)
-    she_choreo = load_choreography(poses_path, she_path)
+    # Both arms share one poses file - parse it once
+    poses = load_poses(poses_path)
+    he_choreo = load_choreography(poses_path, he_path, poses=poses)
+    she_choreo = load_choreography(poses_path, she_path, poses=poses)
     choreographies = {"he": he_choreo, "she": she_choreo}
 
     if verbose:
@@ -16,6 +16,12 @@ if TYPE_CHECKING:
     from ..base import PiperArmBase
 
 
+def _joints_rad(trajectory: Trajectory) -> List[List[float]]:
+    """Convert every waypoint's joints to radians ahead of the timed loop."""
+    radians = math.radians
+    return [list(map(radians, wp.joints_deg)) for wp in trajectory.waypoints]
+
+
 def run_trajectory(
     arm: PiperArmBase,
     trajectory: Trajectory,
@@ -50,17 +56,18 @@ def run_trajectory(
         else:
             print(f"[Trajectory] Executing {len(waypoints)} waypoints over {trajectory.total_duration_s:.1f}s")
 
+    joints_rad_list = _joints_rad(trajectory)
+
     start_time = time.perf_counter()
 
     last_print_time = 0.0
     countdown_printed = set()
 
-    for wp in waypoints:
+    for wp, joints_rad in zip(waypoints, joints_rad_list):
         elapsed = time.perf_counter() - start_time
         wait_time = wp.time_s - elapsed
 
         if not dry_run:
-            joints_rad = [math.radians(d) for d in wp.joints_deg]
             arm.move_joints(joints_rad, wait=0)
             arm._send_gripper_command(wp.gripper)
             if wait_time > 0:
@@ -145,13 +152,14 @@ def run_dual_trajectory(
         if parallel:
             print("[Trajectory] Parallel command mode enabled")
 
-    start_time = time.perf_counter()
-
     iterators = {
-        label: iter(traj.waypoints)
+        label: zip(traj.waypoints, _joints_rad(traj))
         for label, traj in trajectories.items()
     }
-    current_waypoints: Dict[str, Optional[Waypoint]] = {
+
+    start_time = time.perf_counter()
+
+    current_waypoints: Dict[str, Optional[Tuple[Waypoint, List[float]]]] = {
         label: next(it, None)
         for label, it in iterators.items()
     }
@@ -162,27 +170,26 @@ def run_dual_trajectory(
     executor = ThreadPoolExecutor(max_workers=len(arms)) if parallel and not dry_run else None
 
     try:
-        while any(wp is not None for wp in current_waypoints.values()):
+        while any(entry is not None for entry in current_waypoints.values()):
             next_time = min(
-                wp.time_s
-                for wp in current_waypoints.values()
-                if wp is not None
+                entry[0].time_s
+                for entry in current_waypoints.values()
+                if entry is not None
             )
 
             elapsed = time.perf_counter() - start_time
             wait_time = next_time - elapsed
 
-            pending_commands: List[Tuple[str, Waypoint]] = []
-            for label, wp in list(current_waypoints.items()):
-                if wp is not None and abs(wp.time_s - next_time) < 0.001:
-                    pending_commands.append((label, wp))
+            pending_commands: List[Tuple[str, Waypoint, List[float]]] = []
+            for label, entry in list(current_waypoints.items()):
+                if entry is not None and abs(entry[0].time_s - next_time) < 0.001:
+                    pending_commands.append((label, *entry))
                     current_waypoints[label] = next(iterators[label], None)
 
             if not dry_run and pending_commands:
                 if parallel and executor:
                     futures = []
-                    for label, wp in pending_commands:
-                        joints_rad = [math.radians(d) for d in wp.joints_deg]
+                    for label, wp, joints_rad in pending_commands:
                         future = executor.submit(
                             _send_arm_commands,
                             arms[label],
@@ -193,8 +200,7 @@ def run_dual_trajectory(
                     for future in futures:
                         future.result()
                 else:
-                    for label, wp in pending_commands:
-                        joints_rad = [math.radians(d) for d in wp.joints_deg]
+                    for label, wp, joints_rad in pending_commands:
                         arms[label].move_joints(joints_rad, wait=0)
                         arms[label]._send_gripper_command(wp.gripper)
 
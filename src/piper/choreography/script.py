@@ -8,6 +8,7 @@ Supports:
 from __future__ import annotations
 
 import json
+import operator
 import re
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -15,6 +16,9 @@ from typing import Dict, List, Optional, Tuple
 
 JOINT_ORDER = ["J1", "J2", "J3", "J4", "J5", "J6"]
 
+# Fetches all joint values from a joint_positions dict in JOINT_ORDER, in one call
+_JOINT_VALUES = operator.itemgetter(*JOINT_ORDER)
+
 # Conservative speed limits matching URDF joint6 velocity=3 rad/s (~172°/s)
 JOINT_MAX_SPEED_DEG = {
     "J1": 172.0,
@@ -88,8 +92,7 @@ def load_poses(path: Path) -> Dict[str, Pose]:
 
     for scene in data.get("scenes", []):
         name = scene["name"]
-        joints = scene["joint_positions"]
-        joints_deg = [float(joints[j]) for j in JOINT_ORDER]
+        joints_deg = list(map(float, _JOINT_VALUES(scene["joint_positions"])))
         poses[name] = Pose(name=name, joints_deg=joints_deg)
 
     return poses
@@ -158,17 +161,25 @@ def parse_schedule(path: Path) -> Tuple[List[Checkpoint], Optional[float], float
 def load_choreography(
     poses_path: Path | str,
     schedule_path: Path | str,
+    poses: Optional[Dict[str, Pose]] = None,
 ) -> Choreography:
     """
     Load a complete choreography from pose JSON and schedule markdown.
 
     Validates that all poses referenced in the schedule exist.
     Checks for speed limit violations between checkpoints.
+
+    Args:
+        poses_path: Path to poses JSON file
+        schedule_path: Path to schedule markdown file
+        poses: Already-parsed poses (skips re-reading poses_path when
+               several schedules share one poses file)
     """
     poses_path = Path(poses_path)
     schedule_path = Path(schedule_path)
 
-    poses = load_poses(poses_path)
+    if poses is None:
+        poses = load_poses(poses_path)
     checkpoints, bpm, groove_phase = parse_schedule(schedule_path)
     warnings: List[str] = []
 